@@ -18,8 +18,11 @@ Configuration (reads environment variables and optionally .env via python-dotenv
     - OPENAI_MODEL          (fallback for non-Azure) model name
     - OPENAI_ORG            (optional, OpenAI only) organization id
     - OPENAI_SYSTEM_PROMPT  (optional) default system prompt for all chats
+    - OPENAI_PROMPT_CACHE_KEY (optional) prompt cache routing key sent with each request
+    - CHAT_MAX_HISTORY_TOKENS (optional) approximate token budget for each interactive request
     - ASSISTANT_NAME        (optional) label shown for the assistant (default: "Assistant")
     - USER_NAME             (optional) label shown for you (default: "You")
+    - CHAT_WARMUP           (optional) set to off|0|false|no to skip the connection warm-up
 
 Usage examples:
     - Interactive chat:
@@ -36,21 +39,46 @@ Interactive commands:
 from __future__ import annotations
 
 import argparse
+import functools
+import importlib.util
 import os
 import sys
-from typing import List, Optional, Dict, Any, cast
+import threading
+import time
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
-# Optional rich-based coloring for interactive output
-try:
-    from rich.console import Console  # type: ignore
-    from rich.theme import Theme  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    Console = None  # type: ignore[assignment]
-    Theme = None  # type: ignore[assignment]
+# Optional rich-based coloring for interactive output. Only probe for it here;
+# the import itself is deferred to build_console() so one-shot runs skip it.
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+
+# Rich theme: style name -> (override env var, default style).
+THEME_STYLES: Dict[str, Tuple[str, str]] = {
+    "meta.info": ("META_INFO_COLOR", "bold dim"),
+    "user.prefix": ("USER_PREFIX_COLOR", "bold cyan"),
+    "assistant.prefix": ("ASSISTANT_PREFIX_COLOR", "bold green"),
+    "assistant.text": ("ASSISTANT_TEXT_COLOR", "green"),
+    "system.prefix": ("SYSTEM_PREFIX_COLOR", "bold magenta"),
+}
+
+# Streamed tokens are buffered and written once either limit is reached.
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.016
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> None:
+    """
+    Load .env into the process environment exactly once.
+
+    load_dotenv() re-reads and re-parses the file on every call; the helpers
+    below all go through this cached wrapper instead. Variables already set in
+    the environment are never overridden.
+    """
+    load_dotenv()
 
 
 def getenv_required(name: str) -> str:
@@ -73,23 +101,55 @@ def getenv_required(name: str) -> str:
     return value
 
 
+@functools.lru_cache(maxsize=1)
 def get_client() -> OpenAI:
     """
         Create and return an OpenAI client configured from the environment.
 
         Notes:
-            - load_dotenv() is idempotent; calling here ensures .env is considered
-                even if callers forget to preload it.
+            - Created once per process so every caller shares one client and its
+                keep-alive HTTP connection pool (no repeated TCP/TLS handshakes).
+            - load_env() parses .env once per process; calling here ensures it is
+                considered even if callers forget to preload it.
             - OPENAI_BASE_URL and OPENAI_API_KEY are required.
             - OPENAI_ORG is optional and only used by OpenAI.
     """
-    load_dotenv()
+    load_env()
     base_url = getenv_required("OPENAI_BASE_URL")
     api_key = getenv_required("OPENAI_API_KEY")
     org = os.getenv("OPENAI_ORG")
     return OpenAI(base_url=base_url, api_key=api_key, organization=org or None)
 
 
+def warm_up_connection(client: OpenAI) -> Optional[threading.Thread]:
+    """
+    Open the HTTPS connection to the endpoint in the background.
+
+    Issues a cheap GET /models on a daemon thread so the TCP/TLS handshake
+    happens while the user types; the first chat request then reuses the
+    pooled keep-alive connection. Failures are ignored.
+
+    Env:
+        CHAT_WARMUP set to off|0|false|no disables the warm-up.
+
+    Returns:
+        The started thread, or None when disabled.
+    """
+    if (os.getenv("CHAT_WARMUP") or "").strip().lower() in {"off", "0", "false", "no"}:
+        return None
+
+    def _warm() -> None:
+        try:
+            client.with_options(timeout=5.0, max_retries=0).models.list()
+        except Exception:
+            # Purely an optimization; the real request reports any errors.
+            pass
+
+    thread = threading.Thread(target=_warm, name="chat-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def get_assistant_name() -> str:
     """
     Get the assistant's display name used in interactive mode.
@@ -97,7 +157,7 @@ def get_assistant_name() -> str:
     Env:
         ASSISTANT_NAME (default: "Assistant")
     """
-    load_dotenv()
+    load_env()
     return os.getenv("ASSISTANT_NAME", "Assistant")
 
 
@@ -108,22 +168,25 @@ def get_user_name() -> str:
     Env:
         USER_NAME (default: "You")
     """
-    load_dotenv()
+    load_env()
     return os.getenv("USER_NAME", "You")
 
 
+@functools.lru_cache(maxsize=1)
 def build_console() -> Optional[Any]:
     """
         Return a Rich Console with a custom theme for colorized output, or None.
 
         Behavior and overrides:
+            - Built once per process; later calls return the same Console.
+                Call build_console.cache_clear() after changing color settings.
             - If "rich" is not installed, returns None silently.
             - Respects NO_COLOR or CHAT_COLOR=off to disable colors.
             - Colors can be customized via:
                     USER_PREFIX_COLOR, ASSISTANT_PREFIX_COLOR, ASSISTANT_TEXT_COLOR,
                     SYSTEM_PREFIX_COLOR, META_INFO_COLOR.
     """
-    if Console is None or Theme is None:
+    if not RICH_AVAILABLE:
         return None
 
     # Color disable toggles
@@ -133,17 +196,15 @@ def build_console() -> Optional[Any]:
     if chat_color in {"off", "0", "false", "no"}:
         return None
 
-    # Defaults
     theme_map: Dict[str, str] = {
-        "meta.info": "bold dim",
-        "user.prefix": os.getenv("USER_PREFIX_COLOR", "bold cyan"),
-        "assistant.prefix": os.getenv("ASSISTANT_PREFIX_COLOR", "bold green"),
-        "assistant.text": os.getenv("ASSISTANT_TEXT_COLOR", "green"),
-        "system.prefix": os.getenv("SYSTEM_PREFIX_COLOR", "bold magenta"),
+        style: os.getenv(env_name) or default for style, (env_name, default) in THEME_STYLES.items()
     }
-    # Optional override for meta color
-    if os.getenv("META_INFO_COLOR"):
-        theme_map["meta.info"] = os.getenv("META_INFO_COLOR", theme_map["meta.info"])  # type: ignore[index]
+
+    try:
+        from rich.console import Console  # type: ignore
+        from rich.theme import Theme  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
 
     theme = Theme(theme_map)
     return Console(theme=theme)
@@ -160,7 +221,7 @@ def resolve_model() -> str:
         Raises:
                 SystemExit: If neither environment variable is set (exit code 2).
     """
-    load_dotenv()
+    load_env()
     model = os.getenv("OPENAI_DEPLOYMENT") or os.getenv("OPENAI_MODEL")
     if not model:
         print(
@@ -178,6 +239,254 @@ def system_prompt_from_env() -> Optional[str]:
     return os.getenv("OPENAI_SYSTEM_PROMPT")
 
 
+def prompt_cache_key_from_env() -> Optional[str]:
+    """
+    Return the prompt cache key from OPENAI_PROMPT_CACHE_KEY if set, else None.
+
+    Requests sharing a key are routed to the same prompt cache, so repeated
+    prefixes (system prompt, earlier turns) are reused server-side. Unset by
+    default because not every OpenAI-compatible endpoint accepts the field.
+    """
+    return os.getenv("OPENAI_PROMPT_CACHE_KEY") or None
+
+
+class _DeltaFlusher:
+    """
+    Coalesce streamed text deltas into fewer terminal writes.
+
+    Buffered text is written at the end of each line or once STREAM_FLUSH_CHARS
+    characters are pending. Anything still pending is written by a background
+    thread at most STREAM_FLUSH_INTERVAL seconds after it arrived, so a pause
+    in the stream never holds text back. Output goes either via the Rich
+    console (styled) or straight to stdout. Call close() when the stream ends.
+    """
+
+    def __init__(self, console: Optional[Any], style: str, interval: float = STREAM_FLUSH_INTERVAL) -> None:
+        self._console = console
+        self._style = style
+        self._interval = interval
+        self._buf: List[str] = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._write = sys.stdout.write
+        self._flush = sys.stdout.flush
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            self._buf.append(text)
+            self._size += len(text)
+            if "\n" in text or self._size >= STREAM_FLUSH_CHARS:
+                self._drain()
+                return
+            self._pending.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chat-stream-flush", daemon=True)
+                self._thread.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._drain()
+
+    def close(self) -> None:
+        """Write any pending text and stop the background flush thread."""
+        with self._lock:
+            self._drain()
+            self._closed = True
+        self._pending.set()
+
+    def _run(self) -> None:
+        # Wait for pending text, give the stream the interval to add more,
+        # then write whatever is buffered.
+        while True:
+            self._pending.wait()
+            if self._closed:
+                return
+            time.sleep(self._interval)
+            with self._lock:
+                self._pending.clear()
+                self._drain()
+                if self._closed:
+                    return
+
+    def _drain(self) -> None:
+        # Caller holds self._lock.
+        if not self._buf:
+            return
+        text = "".join(self._buf)
+        self._buf.clear()
+        self._size = 0
+        if self._console is not None:
+            # Model output is literal text: batches can contain complete
+            # "[...]" sequences that Rich would otherwise parse as markup.
+            self._console.print(text, end="", style=self._style, markup=False, highlight=False)
+        else:
+            self._write(text)
+            self._flush()
+
+
+def consume_stream(
+    resp_stream: Iterable[Any],
+    *,
+    console: Optional[Any] = None,
+    assistant_style: str = "assistant.text",
+) -> str:
+    """
+        Print a streamed chat completion as it arrives and return the full text.
+
+        Args:
+                resp_stream: Iterable of chat completion chunks (stream=True response).
+                console: Optional Rich console for styled printing; when None, writes to stdout.
+                assistant_style: Rich style name used for assistant tokens.
+
+        Returns:
+                The concatenated assistant text (possibly empty string).
+    """
+    collected: List[str] = []
+    collect = collected.append
+    flusher = _DeltaFlusher(console, assistant_style)
+    write = flusher.write
+    # Iterate server-sent events, collecting partial deltas. Providers may send
+    # chunks without choices (e.g. Azure content-filter results) or without a
+    # delta; skip those explicitly instead of guarding every event with try.
+    try:
+        for event in resp_stream:
+            choices = event.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            text = delta.content if delta is not None else None
+            if text:
+                collect(text)
+                write(text)
+    finally:
+        flusher.close()
+    if console is not None:
+        console.print("")
+    else:
+        print()
+    return "".join(collected)
+
+
+def history_budget_from_env() -> Optional[int]:
+    """
+    Return the interactive history token budget from CHAT_MAX_HISTORY_TOKENS.
+
+    Returns None (unlimited history) when unset or empty.
+
+    Raises:
+        SystemExit: If the value is not a positive integer (exit code 2).
+    """
+    raw = (os.getenv("CHAT_MAX_HISTORY_TOKENS") or "").strip()
+    if not raw:
+        return None
+    try:
+        budget = int(raw)
+    except ValueError:
+        budget = 0
+    if budget <= 0:
+        print(f"Invalid CHAT_MAX_HISTORY_TOKENS: {raw!r} (expected a positive integer)", file=sys.stderr)
+        raise SystemExit(2)
+    return budget
+
+
+def estimate_tokens(message: ChatCompletionMessageParam) -> int:
+    """
+    Roughly estimate the tokens used by a message (~4 characters per token).
+    """
+    content = message.get("content")
+    return len(content) // 4 + 4 if isinstance(content, str) else 4
+
+
+def trim_history(
+    messages: List[ChatCompletionMessageParam],
+    max_tokens: int,
+    reserve_tokens: int = 0,
+) -> int:
+    """
+        Drop the oldest turns until the history fits the budget.
+
+        A turn is a user message plus the assistant replies that follow it;
+        they are removed together so no reply is left without its question.
+        System messages are always kept. The list is mutated in place.
+
+        Args:
+                messages: Conversation history to trim.
+                max_tokens: Approximate token budget for the whole request.
+                reserve_tokens: Tokens already claimed by a message that is about
+                    to be appended (e.g. the pending user prompt).
+
+        Returns:
+                The number of messages removed.
+    """
+    total = reserve_tokens + sum(estimate_tokens(m) for m in messages)
+    removed = 0
+    i = 0
+    while total > max_tokens and i < len(messages):
+        if messages[i]["role"] == "system":
+            i += 1
+            continue
+        dropped = messages.pop(i)
+        total -= estimate_tokens(dropped)
+        removed += 1
+        if dropped["role"] == "user":
+            while i < len(messages) and messages[i]["role"] == "assistant":
+                total -= estimate_tokens(messages.pop(i))
+                removed += 1
+    return removed
+
+
+def _chat_once_sync(
+    client: OpenAI,
+    model: str,
+    messages: List[ChatCompletionMessageParam],
+    extra: Dict[str, Any],
+    console: Optional[Any],
+    assistant_style: str,
+) -> str:
+    """
+    Request a complete (non-streaming) reply, print it and return its text.
+    """
+    completion = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        **extra,
+    )
+    content = completion.choices[0].message.content or ""
+    if console is not None:
+        console.print(content, style=assistant_style, markup=False, highlight=False)
+    else:
+        print(content)
+    return content
+
+
+def _chat_once_stream(
+    client: OpenAI,
+    model: str,
+    messages: List[ChatCompletionMessageParam],
+    extra: Dict[str, Any],
+    console: Optional[Any],
+    assistant_style: str,
+) -> str:
+    """
+    Stream a reply, printing tokens as they arrive, and return its text.
+
+    Any error while streaming falls back to a non-streaming request.
+    """
+    try:
+        resp_stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            **extra,
+        )
+        return consume_stream(resp_stream, console=console, assistant_style=assistant_style)
+    except Exception:
+        return _chat_once_sync(client, model, messages, extra, console, assistant_style)
+
+
 def chat_once(
     client: OpenAI,
     model: str,
@@ -187,6 +496,8 @@ def chat_once(
     *,
     console: Optional[Any] = None,
     assistant_style: str = "assistant.text",
+    prompt_cache_key: Optional[str] = None,
+    prediction: Optional[str] = None,
 ) -> str:
     """
         Send a single user prompt to the chat model and return the assistant reply.
@@ -195,7 +506,8 @@ def chat_once(
             - Appends the user message to ``messages`` and, after completion,
                 appends the assistant message as well (mutates the list in-place).
             - If ``stream`` is True, attempts to stream tokens and prints them as
-                they arrive; if streaming fails for any reason, automatically falls
+                they arrive (coalesced into small batches to limit terminal
+                writes); if streaming fails for any reason, automatically falls
                 back to a non-streaming request.
 
         Args:
@@ -206,61 +518,35 @@ def chat_once(
                 stream: Whether to request a streaming response.
                 console: Optional Rich console for styled printing; when None, uses print().
                 assistant_style: Rich style name used for assistant tokens.
+                prompt_cache_key: Optional prompt cache key forwarded to the API.
+                prediction: Optional predicted output (e.g. the file being edited);
+                    tokens matching it can be produced faster by the server.
 
         Returns:
                 The assistant's final response text (possibly empty string).
     """
-    messages.append(cast(ChatCompletionMessageParam, {"role": "user", "content": prompt}))
-
-    if stream:
-        try:
-            resp_stream = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                stream=True,
-            )
-            collected: List[str] = []
-            # Iterate server-sent events, collecting partial deltas.
-            for event in resp_stream:
-                try:
-                    delta = event.choices[0].delta
-                    text = getattr(delta, "content", None)
-                    if text:
-                        collected.append(text)
-                        if console is not None:
-                            console.print(text, end="", style=assistant_style)
-                        else:
-                            print(text, end="", flush=True)
-                except Exception:
-                    # Be resilient to any schema/shape differences from providers.
-                    pass
-            if console is not None:
-                console.print("")
-            else:
-                print()
-            assistant_text = "".join(collected)
-        except Exception:
-        # Any error while streaming -> fallback to non-streaming mode.
-            stream = False
-        else:
-            messages.append(cast(ChatCompletionMessageParam, {"role": "assistant", "content": assistant_text}))
-            return assistant_text
-
-    # Non-streaming path (also used as a fallback when streaming fails)
-    completion = client.chat.completions.create(
-        model=model,
-        messages=messages,
-    )
-    content = completion.choices[0].message.content or ""
-    if console is not None:
-        console.print(content, style=assistant_style)
-    else:
-        print(content)
-    messages.append(cast(ChatCompletionMessageParam, {"role": "assistant", "content": content}))
+    messages.append({"role": "user", "content": prompt})
+
+    # Only send optional fields when set; strict endpoints reject unknown keys.
+    extra: Dict[str, Any] = {}
+    if prompt_cache_key:
+        extra["prompt_cache_key"] = prompt_cache_key
+    if prediction:
+        extra["prediction"] = {"type": "content", "content": prediction}
+
+    reply = _chat_once_stream if stream else _chat_once_sync
+    content = reply(client, model, messages, extra, console, assistant_style)
+    messages.append({"role": "assistant", "content": content})
     return content
 
 
-def interactive_chat(model: str, system_prompt: Optional[str], stream: bool) -> int:
+def interactive_chat(
+    model: str,
+    system_prompt: Optional[str],
+    stream: bool,
+    prompt_cache_key: Optional[str] = None,
+    max_history_tokens: Optional[int] = None,
+) -> int:
     """
         Run an interactive chat session with the assistant in the terminal.
 
@@ -269,15 +555,26 @@ def interactive_chat(model: str, system_prompt: Optional[str], stream: bool) ->
                     /exit, /quit -> leave the session
                     /clear       -> reset conversation history (preserves system prompt)
             - Optional token streaming for responses.
+            - Warms up the HTTPS connection in the background while the first
+                prompt is typed (see warm_up_connection).
+            - Optional history budget: when ``max_history_tokens`` is set, the
+                oldest turns are dropped before each request so the request
+                (history plus the new prompt) stays within roughly that many
+                tokens; a notice is printed when that happens.
 
         Returns:
                 0 on normal exit.
     """
     client = get_client()
+    warm_up_connection(client)
     messages: List[ChatCompletionMessageParam] = []  # entire conversation state
-    if system_prompt:
+    # Built once and reused to reseed the history after /clear.
+    system_msg: Optional[ChatCompletionMessageParam] = (
+        {"role": "system", "content": system_prompt} if system_prompt else None
+    )
+    if system_msg is not None:
         # Seed the conversation with a system message if provided.
-        messages.append(cast(ChatCompletionMessageParam, {"role": "system", "content": system_prompt}))
+        messages.append(system_msg)
 
     assistant_name = get_assistant_name()
     user_name = get_user_name()
@@ -300,14 +597,27 @@ def interactive_chat(model: str, system_prompt: Optional[str], stream: bool) ->
             if user in {"/exit", "/quit"}:
                 break
             if user == "/clear":
-                # Reset history; keep system message if one was set.
-                messages = [cast(ChatCompletionMessageParam, {"role": "system", "content": system_prompt})] if system_prompt else []
+                # Reset history in place; keep system message if one was set.
+                messages.clear()
+                if system_msg is not None:
+                    messages.append(system_msg)
                 if console is not None:
                     console.print("History cleared.", style="meta.info")
                 else:
                     print("History cleared.")
                 continue
 
+            if max_history_tokens is not None:
+                # Count the pending prompt so the request as sent fits the budget.
+                pending = estimate_tokens({"role": "user", "content": user})
+                dropped = trim_history(messages, max_history_tokens, reserve_tokens=pending)
+                if dropped:
+                    note = f"Dropped {dropped} earlier message(s) to stay within CHAT_MAX_HISTORY_TOKENS."
+                    if console is not None:
+                        console.print(note, style="meta.info")
+                    else:
+                        print(note)
+
             if console is not None:
                 console.print(f"{assistant_name}:", style="assistant.prefix", end=" ")
             else:
@@ -320,6 +630,7 @@ def interactive_chat(model: str, system_prompt: Optional[str], stream: bool) ->
                 stream=stream,
                 console=console,
                 assistant_style="assistant.text",
+                prompt_cache_key=prompt_cache_key,
             )
     except KeyboardInterrupt:
         if console is not None:
@@ -329,7 +640,14 @@ def interactive_chat(model: str, system_prompt: Optional[str], stream: bool) ->
     return 0
 
 
-def one_shot(model: str, system_prompt: Optional[str], prompt: str, stream: bool) -> int:
+def one_shot(
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    stream: bool,
+    prompt_cache_key: Optional[str] = None,
+    prediction: Optional[str] = None,
+) -> int:
     """
     Run a single-turn chat completion and print the response.
 
@@ -338,6 +656,8 @@ def one_shot(model: str, system_prompt: Optional[str], prompt: str, stream: bool
         system_prompt: Optional system message to seed the request.
         prompt: The user question.
         stream: Whether to request streaming output.
+        prompt_cache_key: Optional prompt cache key forwarded to the API.
+        prediction: Optional predicted output sent as a latency hint.
 
     Returns:
         0 on success.
@@ -345,8 +665,16 @@ def one_shot(model: str, system_prompt: Optional[str], prompt: str, stream: bool
     client = get_client()
     messages: List[ChatCompletionMessageParam] = []
     if system_prompt:
-        messages.append(cast(ChatCompletionMessageParam, {"role": "system", "content": system_prompt}))
-    chat_once(client, model, messages, prompt, stream=stream)
+        messages.append({"role": "system", "content": system_prompt})
+    chat_once(
+        client,
+        model,
+        messages,
+        prompt,
+        stream=stream,
+        prompt_cache_key=prompt_cache_key,
+        prediction=prediction,
+    )
     return 0
 
 
@@ -355,20 +683,36 @@ def main(argv: list[str]) -> int:
         Parse CLI arguments and run either one-shot or interactive mode.
 
         Contract:
-            - Exit code 0 on success; 2 for missing required env vars.
+            - Exit code 0 on success; 2 for missing or invalid env vars.
     """
     parser = argparse.ArgumentParser(description="CLI chat for Azure/OpenAI-compatible endpoints")
     parser.add_argument("--prompt", help="One-shot prompt; if omitted, starts interactive chat")
     parser.add_argument("--no-stream", action="store_true", help="Disable streaming output")
+    parser.add_argument(
+        "--prediction-file",
+        metavar="PATH",
+        help="One-shot only: file with the expected output (e.g. code being edited) sent as a predicted output",
+    )
 
     args = parser.parse_args(argv)
+    if args.prediction_file and not args.prompt:
+        parser.error("--prediction-file requires --prompt")
+    prediction: Optional[str] = None
+    if args.prediction_file:
+        try:
+            with open(args.prediction_file, encoding="utf-8") as fh:
+                prediction = fh.read()
+        except (OSError, UnicodeDecodeError) as exc:
+            print(f"Cannot read prediction file: {exc}", file=sys.stderr)
+            return 2
     model = resolve_model()
     system_prompt = system_prompt_from_env()
+    prompt_cache_key = prompt_cache_key_from_env()
     stream = not args.no_stream
 
     if args.prompt:
-        return one_shot(model, system_prompt, args.prompt, stream)
-    return interactive_chat(model, system_prompt, stream)
+        return one_shot(model, system_prompt, args.prompt, stream, prompt_cache_key, prediction)
+    return interactive_chat(model, system_prompt, stream, prompt_cache_key, history_budget_from_env())
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
+import io
 import os
+import sys
+import time
 import types
 import builtins
 
@@ -69,9 +72,13 @@ class _FakeCompletions:
     def __init__(self, stream_chunks: list[str] | None = None, final_text: str = "OK"):
         self._stream_chunks = stream_chunks or []
         self._final_text = final_text
+        self.last_kwargs: dict = {}
+        self.sent: list[list[dict]] = []
 
-    def create(self, *, model, messages, stream=False):  # noqa: D401 - match signature
+    def create(self, *, model, messages, stream=False, **kwargs):  # noqa: D401 - match signature
     # Return iterable of events for stream=True, else a non-streaming completion
+        self.last_kwargs = kwargs
+        self.sent.append(list(messages))
         if stream:
             def _iter():
                 for chunk in self._stream_chunks:
@@ -117,3 +124,335 @@ def test_chat_once_streaming():
     assert messages[0]["role"] == "user"
     assert messages[1]["role"] == "assistant"
     assert messages[1].get("content") == "hello"
+
+
+def test_chat_once_streaming_prints_all_chunks(capsys):
+    """Plain streaming output contains every chunk followed by a newline."""
+    client = _FakeClient(stream_chunks=["a", "b", "c"])
+    chat_mod.chat_once(client, "dummy-model", [], "hi", stream=True, console=None)  # type: ignore[arg-type]
+    assert capsys.readouterr().out == "abc\n"
+
+
+def test_chat_once_prompt_cache_key():
+    """The prompt cache key is only sent when configured."""
+    client = _FakeClient()
+    chat_mod.chat_once(client, "dummy-model", [], "hi", stream=False)  # type: ignore[arg-type]
+    assert client.chat.completions.last_kwargs == {}
+    chat_mod.chat_once(client, "dummy-model", [], "hi", stream=False, prompt_cache_key="k1")  # type: ignore[arg-type]
+    assert client.chat.completions.last_kwargs == {"prompt_cache_key": "k1"}
+
+
+def test_build_console_respects_no_color(monkeypatch):
+    """NO_COLOR disables the Rich console without importing rich."""
+    monkeypatch.setenv("NO_COLOR", "1")
+    for name in ("rich.console", "rich.theme"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    chat_mod.build_console.cache_clear()
+    assert chat_mod.build_console() is None
+    chat_mod.build_console.cache_clear()
+    assert "rich.console" not in sys.modules
+    assert "rich.theme" not in sys.modules
+
+
+def test_build_console_is_cached(monkeypatch):
+    """Repeated calls reuse the same console instead of rebuilding it."""
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.setenv("CHAT_COLOR", "on")
+    chat_mod.build_console.cache_clear()
+    assert chat_mod.build_console() is chat_mod.build_console()
+    chat_mod.build_console.cache_clear()
+
+
+class _FakeConsole:
+    def __init__(self):
+        self.printed: list[str] = []
+
+    def print(self, text="", end="\n", style=None, markup=None, highlight=None):
+        self.printed.append(text + end)
+
+
+def test_chat_once_streaming_console_batches_chunks():
+    """Rich output receives the streamed text in coalesced writes."""
+    console = _FakeConsole()
+    client = _FakeClient(stream_chunks=["he", "l", "lo"])
+    chat_mod.chat_once(client, "dummy-model", [], "hi", stream=True, console=console)  # type: ignore[arg-type]
+    assert "".join(console.printed) == "hello\n"
+    assert len(console.printed) < 4
+
+
+def test_interactive_clear_keeps_system_prompt(monkeypatch):
+    """/clear drops prior turns but reseeds the system message."""
+    client = _FakeClient()
+    inputs = iter(["first", "/clear", "second", "/exit"])
+    monkeypatch.setattr(chat_mod, "get_client", lambda: client)
+    monkeypatch.setattr(builtins, "input", lambda _prompt="": next(inputs))
+    monkeypatch.setenv("NO_COLOR", "1")
+    monkeypatch.setenv("CHAT_WARMUP", "off")
+    chat_mod.build_console.cache_clear()
+    assert chat_mod.interactive_chat("dummy-model", "be brief", stream=False) == 0
+    chat_mod.build_console.cache_clear()
+    last = client.chat.completions.sent[-1]
+    assert [m["role"] for m in last] == ["system", "user"]
+    assert last[0]["content"] == "be brief"
+    assert last[1]["content"] == "second"
+
+
+def test_load_env_parses_dotenv_once(monkeypatch):
+    """Repeated env helpers share a single .env parse."""
+    calls = []
+    monkeypatch.setattr(chat_mod, "load_dotenv", lambda *a, **k: calls.append(1))
+    chat_mod.load_env.cache_clear()
+    monkeypatch.setenv("OPENAI_DEPLOYMENT", "d")
+    chat_mod.resolve_model()
+    chat_mod.get_assistant_name()
+    chat_mod.get_user_name()
+    assert len(calls) == 1
+    chat_mod.load_env.cache_clear()
+
+
+def test_delta_flusher_flushes_on_newline():
+    """A completed line is written immediately instead of waiting for more text."""
+    console = _FakeConsole()
+    flusher = chat_mod._DeltaFlusher(console, "assistant.text", interval=60.0)
+    flusher.write("ab")
+    assert console.printed == []
+    flusher.write("c\n")
+    assert console.printed == ["abc\n"]
+    flusher.close()
+
+
+def test_build_console_theme_overrides(monkeypatch):
+    """Color env vars override the default theme styles."""
+    rich_style = pytest.importorskip("rich.style")
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.setenv("CHAT_COLOR", "on")
+    monkeypatch.setenv("ASSISTANT_TEXT_COLOR", "red")
+    monkeypatch.delenv("META_INFO_COLOR", raising=False)
+    chat_mod.build_console.cache_clear()
+    console = chat_mod.build_console()
+    chat_mod.build_console.cache_clear()
+    assert console.get_style("assistant.text") == rich_style.Style.parse("red")
+    assert console.get_style("meta.info") == rich_style.Style.parse("bold dim")
+
+
+def test_consume_stream_skips_events_without_choices(capsys):
+    """Chunks with no choices (e.g. content-filter results) are ignored."""
+    empty = types.SimpleNamespace(choices=[])
+    no_delta = types.SimpleNamespace(choices=[types.SimpleNamespace(delta=None)])
+    events = [empty, _StreamEvent("hi"), no_delta, _StreamEvent(None)]
+    assert chat_mod.consume_stream(events) == "hi"
+    assert capsys.readouterr().out == "hi\n"
+
+
+def test_get_client_is_shared(monkeypatch):
+    """All callers share one client (and its connection pool)."""
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:9/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    chat_mod.get_client.cache_clear()
+    assert chat_mod.get_client() is chat_mod.get_client()
+    chat_mod.get_client.cache_clear()
+
+
+def test_trim_history_keeps_system_and_newest():
+    """Oldest non-system messages are dropped until the budget fits."""
+    messages = [
+        {"role": "system", "content": "s" * 8},
+        {"role": "user", "content": "a" * 40},
+        {"role": "assistant", "content": "b" * 40},
+        {"role": "user", "content": "c" * 40},
+    ]
+    removed = chat_mod.trim_history(messages, max_tokens=30)  # type: ignore[arg-type]
+    assert removed == 2
+    assert [m["content"][0] for m in messages] == ["s", "c"]
+
+
+def test_trim_history_drops_whole_turns():
+    """A user message and its assistant reply are dropped together."""
+    messages = [
+        {"role": "system", "content": "s" * 8},
+        {"role": "user", "content": "a" * 40},
+        {"role": "assistant", "content": "b" * 40},
+        {"role": "user", "content": "c" * 40},
+        {"role": "assistant", "content": "d" * 40},
+    ]
+    removed = chat_mod.trim_history(messages, max_tokens=50)  # type: ignore[arg-type]
+    assert removed == 2
+    assert [m["role"] for m in messages] == ["system", "user", "assistant"]
+    assert [m["content"][0] for m in messages] == ["s", "c", "d"]
+
+
+def test_history_budget_from_env(monkeypatch):
+    """Unset means unlimited; non-integer values exit with code 2."""
+    monkeypatch.setenv("CHAT_MAX_HISTORY_TOKENS", "")
+    assert chat_mod.history_budget_from_env() is None
+    monkeypatch.setenv("CHAT_MAX_HISTORY_TOKENS", "3000")
+    assert chat_mod.history_budget_from_env() == 3000
+    monkeypatch.setenv("CHAT_MAX_HISTORY_TOKENS", "lots")
+    with pytest.raises(SystemExit) as exc:
+        chat_mod.history_budget_from_env()
+    assert exc.value.code == 2
+
+
+def test_chat_once_prediction():
+    """A predicted output is forwarded as a content prediction."""
+    client = _FakeClient()
+    chat_mod.chat_once(client, "dummy-model", [], "edit", stream=False, prediction="old text")  # type: ignore[arg-type]
+    assert client.chat.completions.last_kwargs == {"prediction": {"type": "content", "content": "old text"}}
+
+
+def test_main_prediction_file_requires_prompt():
+    with pytest.raises(SystemExit) as exc:
+        chat_mod.main(["--prediction-file", "x.txt"])
+    assert exc.value.code == 2
+
+
+def test_chat_once_stream_falls_back_to_non_streaming():
+    """A failing stream request is retried without streaming."""
+    client = _FakeClient(final_text="FALLBACK")
+
+    def _iter_fail():
+        raise RuntimeError("stream broken")
+        yield  # pragma: no cover
+
+    original = client.chat.completions.create
+
+    def create(*, model, messages, stream=False, **kwargs):
+        return _iter_fail() if stream else original(model=model, messages=messages, **kwargs)
+
+    client.chat.completions.create = create  # type: ignore[method-assign]
+    messages: list[dict] = []
+    out = chat_mod.chat_once(client, "dummy-model", messages, "hi", stream=True)  # type: ignore[arg-type]
+    assert out == "FALLBACK"
+    assert [m["role"] for m in messages] == ["user", "assistant"]
+
+
+class _FakeModels:
+    def __init__(self):
+        self.listed = 0
+
+    def list(self):
+        self.listed += 1
+        return []
+
+
+class _WarmClient:
+    def __init__(self):
+        self.models = _FakeModels()
+        self.options: dict = {}
+
+    def with_options(self, **options):
+        self.options = options
+        return self
+
+
+def test_warm_up_connection(monkeypatch):
+    """Warm-up lists models once in the background; CHAT_WARMUP=off skips it."""
+    client = _WarmClient()
+    monkeypatch.delenv("CHAT_WARMUP", raising=False)
+    thread = chat_mod.warm_up_connection(client)  # type: ignore[arg-type]
+    assert thread is not None
+    thread.join(timeout=5)
+    assert client.models.listed == 1
+    assert client.options == {"timeout": 5.0, "max_retries": 0}
+    monkeypatch.setenv("CHAT_WARMUP", "off")
+    assert chat_mod.warm_up_connection(client) is None  # type: ignore[arg-type]
+
+
+def test_consume_stream_rich_prints_brackets_literally():
+    """Bracketed model output is not parsed as Rich markup once batched."""
+    rich_console = pytest.importorskip("rich.console")
+    out = io.StringIO()
+    console = rich_console.Console(file=out, force_terminal=False, width=200)
+    events = [_StreamEvent(t) for t in ["x = ", "arr", "[", "i", "]", " + 1. Use ", "[/", "b] to close"]]
+    text = chat_mod.consume_stream(events, console=console, assistant_style="green")
+    assert text == "x = arr[i] + 1. Use [/b] to close"
+    assert out.getvalue() == "x = arr[i] + 1. Use [/b] to close\n"
+
+
+def test_main_prediction_file_not_utf8(tmp_path, capsys):
+    """An unreadable prediction file exits with code 2 and a clear message."""
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"\xff\xfe\x00\x80")
+    assert chat_mod.main(["--prompt", "hi", "--prediction-file", str(path)]) == 2
+    assert "Cannot read prediction file" in capsys.readouterr().err
+
+
+def test_main_passes_prediction_to_chat_once(tmp_path, monkeypatch):
+    """The prediction file contents reach the API request."""
+    path = tmp_path / "app.py"
+    path.write_text("print('old')\n", encoding="utf-8")
+    client = _FakeClient()
+    monkeypatch.setattr(chat_mod, "get_client", lambda: client)
+    monkeypatch.setenv("OPENAI_DEPLOYMENT", "dummy-model")
+    monkeypatch.setenv("OPENAI_PROMPT_CACHE_KEY", "")
+    assert chat_mod.main(["--prompt", "edit", "--no-stream", "--prediction-file", str(path)]) == 0
+    assert client.chat.completions.last_kwargs == {
+        "prediction": {"type": "content", "content": "print('old')\n"}
+    }
+
+
+def test_delta_flusher_flushes_pending_text_after_pause():
+    """Text is written within the flush interval even if no further delta arrives."""
+    console = _FakeConsole()
+    flusher = chat_mod._DeltaFlusher(console, "assistant.text", interval=0.01)
+    flusher.write("Hello")
+    flusher.write(" wor")
+    time.sleep(0.5)
+    assert "".join(console.printed) == "Hello wor"
+    flusher.write("ld")
+    time.sleep(0.5)
+    assert "".join(console.printed) == "Hello world"
+    flusher.close()
+
+
+class _RecordingStdout:
+    def __init__(self):
+        self.written: list[str] = []
+        self.flushed: list[str] = []
+
+    def write(self, text):
+        self.written.append(text)
+        return len(text)
+
+    def flush(self):
+        self.flushed.append("".join(self.written))
+
+
+def test_delta_flusher_plain_path_flushes_stdout_after_pause(monkeypatch):
+    """Plain output is written and flushed to stdout without waiting for the next delta."""
+    out = _RecordingStdout()
+    monkeypatch.setattr(sys, "stdout", out)
+    flusher = chat_mod._DeltaFlusher(None, "assistant.text", interval=0.01)
+    flusher.write("Hel")
+    flusher.write("lo")
+    time.sleep(0.5)
+    assert out.flushed and out.flushed[-1] == "Hello"
+    flusher.close()
+
+
+def test_delta_flusher_flushes_text_after_last_newline():
+    """Text following a burst's last newline is written without further input."""
+    console = _FakeConsole()
+    flusher = chat_mod._DeltaFlusher(console, "assistant.text", interval=0.01)
+    flusher.write("line one\nline")
+    assert console.printed == ["line one\nline"]
+    flusher.write(" two")
+    time.sleep(0.5)
+    assert "".join(console.printed) == "line one\nline two"
+    flusher.close()
+
+
+def test_interactive_history_budget_counts_prompt(monkeypatch, capsys):
+    """The pending prompt counts toward the budget and drops are announced."""
+    client = _FakeClient(final_text="b" * 40)
+    inputs = iter(["a" * 40, "c" * 40, "/exit"])
+    monkeypatch.setattr(chat_mod, "get_client", lambda: client)
+    monkeypatch.setattr(builtins, "input", lambda _prompt="": next(inputs))
+    monkeypatch.setenv("NO_COLOR", "1")
+    monkeypatch.setenv("CHAT_WARMUP", "off")
+    chat_mod.build_console.cache_clear()
+    # History after turn one is 28 tokens; with the 14-token prompt it exceeds 40.
+    assert chat_mod.interactive_chat("dummy-model", None, stream=False, max_history_tokens=40) == 0
+    chat_mod.build_console.cache_clear()
+    assert [m["content"][0] for m in client.chat.completions.sent[-1]] == ["c"]
+    assert "Dropped 2 earlier message(s)" in capsys.readouterr().out